@@ -0,0 +1,68 @@
+"""
+Incremental analytics fed from the report_transitions log.
+
+Consumers run on the analytics leader loop (AnalyticsScheduler in
+scheduler.py); the read endpoints only query their output tables. Each
+consumer keeps its position in consumer_checkpoints and only reads
+transitions after it. Aggregates and checkpoint move in one transaction,
+so a transition is counted exactly once even if two runs race.
+"""
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from . import crud, models
+from .write_queue import run_write
+
+STATUS_DWELL = "status_dwell"
+
+
+def consume_status_dwell(db: Session, limit: int = 1000) -> int:
+    """Fold the next batch of status transitions into status_dwell_stats. Returns rows read."""
+    position = crud.get_checkpoint(db, STATUS_DWELL)
+    rows = crud.read_transitions(db, after=position, limit=limit)
+    if not rows:
+        return 0
+    totals: dict[tuple[str, str], list[float]] = {}
+    for t in rows:
+        if t.field != "status" or t.from_value is None or t.dwell_seconds is None:
+            continue
+        acc = totals.setdefault((t.issue_type.value, t.from_value), [0, 0.0])
+        acc[0] += 1
+        acc[1] += t.dwell_seconds
+    for (issue_type, status), (count, seconds) in totals.items():
+        db.execute(
+            text(
+                "INSERT INTO status_dwell_stats (issue_type, status, count, total_seconds) "
+                "VALUES (:it, :st, :c, :s) "
+                "ON CONFLICT(issue_type, status) DO UPDATE SET "
+                "count = status_dwell_stats.count + excluded.count, "
+                "total_seconds = status_dwell_stats.total_seconds + excluded.total_seconds"
+            ),
+            {"it": issue_type, "st": status, "c": count, "s": seconds},
+        )
+    crud.advance_checkpoint(db, STATUS_DWELL, position, rows[-1].id)
+    return len(rows)
+
+
+def catch_up_status_dwell(limit: int = 1000) -> int:
+    """Process every transition appended since the last run. Returns rows read."""
+    total = 0
+    try:
+        while True:
+            n = run_write(lambda db: consume_status_dwell(db, limit))
+            total += n
+            if n < limit:
+                break
+    except crud.CheckpointConflict:
+        # Another worker advanced the checkpoint first and is catching up.
+        pass
+    return total
+
+
+def status_dwell_summary(db: Session) -> list[models.StatusDwellStat]:
+    return (
+        db.query(models.StatusDwellStat)
+        .order_by(models.StatusDwellStat.issue_type, models.StatusDwellStat.status)
+        .all()
+    )
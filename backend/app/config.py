@@ -1,3 +1,4 @@
+from pydantic import model_validator
 from pydantic_settings import BaseSettings
 
 
@@ -11,10 +12,39 @@ class Settings(BaseSettings):
     CLOUDINARY_API_KEY: str = ""
     CLOUDINARY_API_SECRET: str = ""
     CORS_ORIGINS: str = "http://localhost:8080,http://localhost:5173,https://solapur-traffic-engine-main.vercel.app"
+    # SQLite performance mode: WAL + tuned pragmas on connect, and all writes
+    # funnelled through a single group-committing writer thread.
+    SQLITE_PERFORMANCE_MODE: bool = False
+    SQLITE_BUSY_TIMEOUT_MS: int = 5000
+    SQLITE_WRITE_BATCH_SIZE: int = 64
+    SQLITE_WRITE_BATCH_WAIT_MS: int = 2
+    # SLA escalation scheduler (one leader across workers via a DB lease).
+    SLA_SCHEDULER_ENABLED: bool = True
+    SLA_TICK_SECONDS: int = 60
+    SLA_LEASE_SECONDS: int = 180
+    SLA_BATCH_SIZE: int = 500
+    # Transition-log consumers (analytics.py), with their own leader lease.
+    ANALYTICS_CONSUMERS_ENABLED: bool = True
+    ANALYTICS_TICK_SECONDS: int = 30
+    ANALYTICS_LEASE_SECONDS: int = 90
+    # Absolute base for photo URLs in public listings, e.g. https://api.example.org.
+    # When empty, the request's Host is used; the snapshot cache is an LRU either way.
+    PUBLIC_BASE_URL: str = ""
+    SNAPSHOT_MAX_ENTRIES: int = 8
 
     class Config:
         env_file = ".env"
         extra = "ignore"
 
+    @model_validator(mode="after")
+    def _check_leases(self) -> "Settings":
+        # The leader renews its lease once per tick; a lease that expires
+        # before the next tick would let another worker take over mid-run.
+        if self.SLA_LEASE_SECONDS <= self.SLA_TICK_SECONDS:
+            raise ValueError("SLA_LEASE_SECONDS must be greater than SLA_TICK_SECONDS")
+        if self.ANALYTICS_LEASE_SECONDS <= self.ANALYTICS_TICK_SECONDS:
+            raise ValueError("ANALYTICS_LEASE_SECONDS must be greater than ANALYTICS_TICK_SECONDS")
+        return self
+
 
 settings = Settings()
@@ -1,16 +1,18 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import text
+from sqlalchemy import func, text
 from datetime import datetime, timezone
-from . import models, schemas
+from . import models, schemas, sla
 from .database import engine
 from .report_id import report_id_format
+from .write_queue import writer
 import uuid
 
 
-def get_next_report_id(db: Session) -> str:
+def _next_report_id(db: Session) -> str:
     """
     Atomically get next report ID in format SLP-YYYY-XXXX.
-    Uses report_id_counter table for safe increment.
+    Uses report_id_counter table for safe increment; must run in the same
+    transaction as the insert that uses the ID.
     """
     year = datetime.now(timezone.utc).year
     is_sqlite = engine.url.get_backend_name() == "sqlite"
@@ -38,28 +40,79 @@ def get_next_report_id(db: Session) -> str:
     return report_id_format(year, num)
 
 
+REPORTS_VERSION = "reports"
+
+
+def get_data_version(db: Session, name: str = REPORTS_VERSION) -> int:
+    row = db.execute(
+        text("SELECT version FROM data_versions WHERE name = :n"),
+        {"n": name},
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def _bump_data_version(db: Session, name: str = REPORTS_VERSION) -> None:
+    """Invalidate cached listings; runs inside the caller's write transaction."""
+    db.execute(
+        text(
+            "INSERT INTO data_versions (name, version) VALUES (:n, 1) "
+            "ON CONFLICT(name) DO UPDATE SET version = data_versions.version + 1"
+        ),
+        {"n": name},
+    )
+
+
 def create_report(
-    db: Session, data: schemas.ReportCreate, report_id: str | None = None
+    db: Session, data: schemas.ReportCreate, photo_suffix: str | None = None
+) -> models.Report:
+    """
+    Insert a report with a freshly reserved report_id. The ID increment and the
+    insert share one transaction, so a failed insert never burns an ID.
+    If photo_suffix is given, photo_path/image_url are set to
+    uploads/reports/<report_id><suffix>; the caller moves the file there
+    once this returns.
+    """
+    if writer.running:
+        return writer.submit(lambda s: _insert_report(s, data, photo_suffix))
+    r = _insert_report(db, data, photo_suffix)
+    db.commit()
+    db.refresh(r)
+    return r
+
+
+def _insert_report(
+    db: Session, data: schemas.ReportCreate, photo_suffix: str | None
 ) -> models.Report:
     pk = str(uuid.uuid4())
-    if report_id is None:
-        report_id = get_next_report_id(db)
+    report_id = _next_report_id(db)
+    image_url = data.image_url
+    photo_path = data.photo_path
+    if photo_suffix is not None:
+        filename = f"{report_id}{photo_suffix}"
+        photo_path = f"uploads/reports/{filename}"
+        image_url = f"/uploads/reports/{filename}"
     r = models.Report(
         id=pk,
         report_id=report_id,
         issue_type=data.issue_type,
         description=data.description,
-        image_url=data.image_url,
-        photo_path=data.photo_path,
+        image_url=image_url,
+        photo_path=photo_path,
         latitude=data.latitude,
         longitude=data.longitude,
         location_text=data.location_text,
         phone_number=data.phone_number.strip(),
         status=models.ReportStatus.RECEIVED,
         photo_verification_status=None,
+        due_at=sla.compute_due_at(
+            data.issue_type, models.ReportStatus.RECEIVED, datetime.now(timezone.utc)
+        ),
+        escalation_level=0,
     )
     db.add(r)
-    db.commit()
+    _bump_data_version(db)
+    _append_transition(db, r, "status", None, models.ReportStatus.RECEIVED.value, datetime.now(timezone.utc))
+    db.flush()
     db.refresh(r)
     return r
 
@@ -93,16 +146,240 @@ def list_reports(
 
 def update_report_status(
     db: Session, report_id: str, new_status: models.ReportStatus
+) -> models.Report | None:
+    if writer.running:
+        return writer.submit(lambda s: _apply_report_status(s, report_id, new_status))
+    r = _apply_report_status(db, report_id, new_status)
+    if r is not None:
+        db.commit()
+        db.refresh(r)
+    return r
+
+
+def _apply_report_status(
+    db: Session, report_id: str, new_status: models.ReportStatus
 ) -> models.Report | None:
     r = get_report_by_id(db, report_id)
     if not r:
         return None
     now = datetime.now(timezone.utc)
+    old_status = r.status
     r.status = new_status
     if new_status in (models.ReportStatus.ACTION_PLANNED, models.ReportStatus.APPROVED) and r.approved_at is None:
         r.approved_at = now
     if new_status in (models.ReportStatus.CLOSED, models.ReportStatus.IGNORED):
         r.closed_at = now
-    db.commit()
+    _bump_data_version(db)
+    if new_status != old_status:
+        # Entering a new status restarts the SLA clock and clears escalation.
+        r.due_at = sla.compute_due_at(r.issue_type, new_status, now)
+        r.escalated_at = None
+        r.escalation_level = 0
+        entered = _status_entered_at(db, r)
+        dwell = (now - entered).total_seconds() if entered is not None else None
+        _append_transition(db, r, "status", old_status.value, new_status.value, now, dwell)
+    db.flush()
     db.refresh(r)
     return r
+
+
+def update_photo_status(
+    db: Session, report_id: str, photo_status: models.PhotoVerificationStatus
+) -> models.Report | None:
+    if writer.running:
+        return writer.submit(lambda s: _apply_photo_status(s, report_id, photo_status))
+    r = _apply_photo_status(db, report_id, photo_status)
+    if r is not None:
+        db.commit()
+        db.refresh(r)
+    return r
+
+
+def _apply_photo_status(
+    db: Session, report_id: str, photo_status: models.PhotoVerificationStatus
+) -> models.Report | None:
+    r = get_report_by_id(db, report_id)
+    if not r:
+        return None
+    old_status = r.photo_verification_status
+    r.photo_verification_status = photo_status
+    _bump_data_version(db)
+    if photo_status != old_status:
+        _append_transition(
+            db,
+            r,
+            "photo_status",
+            old_status.value if old_status else None,
+            photo_status.value,
+            datetime.now(timezone.utc),
+        )
+    db.flush()
+    db.refresh(r)
+    return r
+
+
+def _append_transition(
+    db: Session,
+    r: models.Report,
+    field: str,
+    from_value: str | None,
+    to_value: str,
+    at: datetime,
+    dwell_seconds: float | None = None,
+) -> None:
+    """
+    Add a report_transitions row to the caller's transaction. Callers bump the
+    data version first: that row lock serializes writers, so transition ids
+    become visible to consumers in id order.
+    """
+    db.add(
+        models.ReportTransition(
+            report_pk=r.id,
+            report_id=r.report_id,
+            issue_type=r.issue_type,
+            field=field,
+            from_value=from_value,
+            to_value=to_value,
+            dwell_seconds=dwell_seconds,
+            created_at=at,
+        )
+    )
+
+
+def _status_entered_at(db: Session, r: models.Report) -> datetime | None:
+    """
+    When the report entered its current status, from the log. None for reports
+    whose entry into this status predates the log, so their dwell is not guessed.
+    """
+    entered = (
+        db.query(func.max(models.ReportTransition.created_at))
+        .filter(
+            models.ReportTransition.report_pk == r.id,
+            models.ReportTransition.field == "status",
+        )
+        .scalar()
+    )
+    # SQLite hands back naive datetimes; everything is stored as UTC.
+    if entered is not None and entered.tzinfo is None:
+        entered = entered.replace(tzinfo=timezone.utc)
+    return entered
+
+
+def read_transitions(db: Session, after: int = 0, limit: int = 500) -> list[models.ReportTransition]:
+    """Transitions with id > after, oldest first."""
+    return (
+        db.query(models.ReportTransition)
+        .filter(models.ReportTransition.id > after)
+        .order_by(models.ReportTransition.id)
+        .limit(limit)
+        .all()
+    )
+
+
+class CheckpointConflict(Exception):
+    """Another consumer run advanced the checkpoint first."""
+
+
+def get_checkpoint(db: Session, name: str) -> int:
+    row = db.execute(
+        text("SELECT position FROM consumer_checkpoints WHERE name = :n"),
+        {"n": name},
+    ).fetchone()
+    return row[0] if row else 0
+
+
+def advance_checkpoint(db: Session, name: str, old: int, new: int) -> None:
+    """
+    Move a consumer from `old` to `new` in the caller's transaction. Raises if
+    another run advanced it first, so the caller's work is rolled back with it.
+    """
+    db.execute(
+        text(
+            "INSERT INTO consumer_checkpoints (name, position) VALUES (:n, 0) "
+            "ON CONFLICT(name) DO NOTHING"
+        ),
+        {"n": name},
+    )
+    res = db.execute(
+        text("UPDATE consumer_checkpoints SET position = :new WHERE name = :n AND position = :old"),
+        {"n": name, "old": old, "new": new},
+    )
+    if res.rowcount != 1:
+        raise CheckpointConflict(f"Checkpoint {name!r} moved concurrently")
+
+
+def escalate_due_reports(db: Session, now: datetime, limit: int) -> int:
+    """
+    Escalate up to `limit` reports whose SLA is due. Uses the due_at index, so
+    the cost is proportional to the number of due reports, not the table size.
+    Escalated reports are rescheduled one SLA window later in case they stay stuck.
+    """
+    due = (
+        db.query(models.Report)
+        .filter(models.Report.due_at <= now)
+        .order_by(models.Report.due_at)
+        .limit(limit)
+        .all()
+    )
+    for r in due:
+        window = sla.sla_window(r.issue_type, r.status)
+        r.escalation_level = (r.escalation_level or 0) + 1
+        r.escalated_at = now
+        r.due_at = now + window if window is not None else None
+    if due:
+        # Escalation touches updated_at, which the public listings include.
+        _bump_data_version(db)
+    db.flush()
+    return len(due)
+
+
+def list_overdue_reports(db: Session, skip: int = 0, limit: int = 100) -> list[models.Report]:
+    return (
+        db.query(models.Report)
+        .filter(models.Report.escalated_at.isnot(None))
+        .order_by(models.Report.escalation_level.desc(), models.Report.escalated_at)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+
+
+def backfill_due_at(db: Session) -> None:
+    """Set due_at for open reports created before SLA tracking existed."""
+    open_statuses = list(sla.SLA_HOURS)
+    rows = (
+        db.query(models.Report)
+        .filter(models.Report.due_at.is_(None), models.Report.status.in_(open_statuses))
+        .all()
+    )
+    for r in rows:
+        since = r.updated_at or r.created_at or datetime.now(timezone.utc)
+        r.due_at = sla.compute_due_at(r.issue_type, r.status, since)
+    db.flush()
+
+
+def acquire_lease(db: Session, name: str, holder: str, ttl_seconds: float, now: float) -> bool:
+    """
+    Take or renew the named lease. Succeeds if the lease is free, expired, or
+    already held by `holder`; returns whether `holder` owns it afterwards.
+    """
+    db.execute(
+        text(
+            "INSERT INTO scheduler_leases (name, holder, expires_at) VALUES (:n, :h, :exp) "
+            "ON CONFLICT(name) DO UPDATE SET holder = excluded.holder, expires_at = excluded.expires_at "
+            "WHERE scheduler_leases.holder = excluded.holder OR scheduler_leases.expires_at < :now"
+        ),
+        {"n": name, "h": holder, "exp": now + ttl_seconds, "now": now},
+    )
+    row = db.execute(
+        text("SELECT holder FROM scheduler_leases WHERE name = :n"),
+        {"n": name},
+    ).fetchone()
+    return row is not None and row[0] == holder
+
+
+def release_lease(db: Session, name: str, holder: str) -> None:
+    db.execute(
+        text("DELETE FROM scheduler_leases WHERE name = :n AND holder = :h"),
+        {"n": name, "h": holder},
+    )
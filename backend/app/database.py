@@ -1,13 +1,16 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker, declarative_base
 from .config import settings
 
+IS_SQLITE = settings.DATABASE_URL.startswith("sqlite")
+SQLITE_PERFORMANCE_MODE = IS_SQLITE and settings.SQLITE_PERFORMANCE_MODE
+
 # Support both SQLite (default for easy local setup) and PostgreSQL/other URLs.
 engine_kwargs: dict = {
     "pool_pre_ping": True,
 }
 
-if settings.DATABASE_URL.startswith("sqlite"):
+if IS_SQLITE:
     # SQLite needs special connect_args and does not use the same pooling params.
     engine_kwargs["connect_args"] = {"check_same_thread": False}
 else:
@@ -24,6 +27,31 @@ SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+if SQLITE_PERFORMANCE_MODE:
+
+    @event.listens_for(engine, "connect")
+    def _set_sqlite_pragmas(dbapi_connection, connection_record) -> None:
+        # Let SQLAlchemy emit BEGIN itself (see _sqlite_begin) so that savepoints
+        # and BEGIN IMMEDIATE behave correctly with pysqlite.
+        dbapi_connection.isolation_level = None
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(settings.SQLITE_BUSY_TIMEOUT_MS)}")
+        # NORMAL is durable across application crashes in WAL mode; only an OS
+        # crash / power loss can roll back the most recent commits.
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.execute("PRAGMA cache_size=-16000")
+        cursor.close()
+
+    @event.listens_for(engine, "begin")
+    def _sqlite_begin(conn) -> None:
+        # Writers pass execution_options(sqlite_begin="IMMEDIATE") to take the
+        # write lock up front instead of failing on a read->write upgrade.
+        mode = conn.get_execution_options().get("sqlite_begin", "")
+        conn.exec_driver_sql(f"BEGIN {mode}".strip())
+
+
 def get_db():
     db = SessionLocal()
     try:
@@ -3,7 +3,11 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
 from pathlib import Path
 
-from .database import Base, engine
+from . import crud
+from .config import settings
+from .database import Base, engine, SessionLocal, SQLITE_PERFORMANCE_MODE
+from .scheduler import analytics_scheduler, scheduler
+from .write_queue import writer
 from .routers import reports, admin
 from sqlalchemy import text
 
@@ -28,11 +32,27 @@ app.include_router(admin.router)
 
 def _run_simple_migrations() -> None:
     """
-    Minimal, SQLite-friendly migrations so older local DBs don't crash
-    when new columns are added.
+    Minimal migrations so older DBs don't crash when new columns are added.
+    create_all() only creates missing tables; it never alters existing ones.
+    Only SQLite and PostgreSQL are migrated; other backends are left alone.
     """
-    if engine.url.get_backend_name() != "sqlite":
+    backend = engine.url.get_backend_name()
+    if backend == "sqlite":
+        _migrate_sqlite()
+    elif backend == "postgresql":
+        _migrate_postgres()
+    else:
         return
+    # Give open reports that predate SLA tracking a due time (no-op afterwards).
+    db = SessionLocal()
+    try:
+        crud.backfill_due_at(db)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _migrate_sqlite() -> None:
     with engine.connect() as conn:
         cols = conn.execute(text("PRAGMA table_info(reports);")).fetchall()
         existing = {row[1] for row in cols}  # type: ignore[index]
@@ -40,6 +60,14 @@ def _run_simple_migrations() -> None:
             conn.execute(text("ALTER TABLE reports ADD COLUMN photo_path VARCHAR(500);"))
         if "photo_verification_status" not in existing:
             conn.execute(text("ALTER TABLE reports ADD COLUMN photo_verification_status VARCHAR(50);"))
+        if "due_at" not in existing:
+            conn.execute(text("ALTER TABLE reports ADD COLUMN due_at DATETIME;"))
+        if "escalated_at" not in existing:
+            conn.execute(text("ALTER TABLE reports ADD COLUMN escalated_at DATETIME;"))
+        if "escalation_level" not in existing:
+            conn.execute(text("ALTER TABLE reports ADD COLUMN escalation_level INTEGER NOT NULL DEFAULT 0;"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_reports_due_at ON reports (due_at);"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_reports_escalated_at ON reports (escalated_at);"))
         conn.commit()
         # Ensure report_id_counter exists for atomic SLP-YYYY-XXXX generation
         conn.execute(text(
@@ -48,10 +76,35 @@ def _run_simple_migrations() -> None:
         conn.commit()
 
 
+def _migrate_postgres() -> None:
+    with engine.connect() as conn:
+        conn.execute(text("ALTER TABLE reports ADD COLUMN IF NOT EXISTS due_at TIMESTAMP WITH TIME ZONE;"))
+        conn.execute(text("ALTER TABLE reports ADD COLUMN IF NOT EXISTS escalated_at TIMESTAMP WITH TIME ZONE;"))
+        conn.execute(text(
+            "ALTER TABLE reports ADD COLUMN IF NOT EXISTS escalation_level INTEGER NOT NULL DEFAULT 0;"
+        ))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_reports_due_at ON reports (due_at);"))
+        conn.execute(text("CREATE INDEX IF NOT EXISTS ix_reports_escalated_at ON reports (escalated_at);"))
+        conn.commit()
+
+
 @app.on_event("startup")
 def startup() -> None:
     Base.metadata.create_all(bind=engine)
     _run_simple_migrations()
+    if SQLITE_PERFORMANCE_MODE:
+        writer.start()
+    if settings.SLA_SCHEDULER_ENABLED:
+        scheduler.start()
+    if settings.ANALYTICS_CONSUMERS_ENABLED:
+        analytics_scheduler.start()
+
+
+@app.on_event("shutdown")
+def shutdown() -> None:
+    scheduler.stop()
+    analytics_scheduler.stop()
+    writer.stop()
 
 
 @app.get("/health")
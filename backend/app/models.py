@@ -11,6 +11,21 @@ class ReportIdCounter(Base):
     next_num = Column(Integer, nullable=False, default=1)
 
 
+class DataVersion(Base):
+    """Monotonic version per dataset, bumped in the same transaction as each write."""
+    __tablename__ = "data_versions"
+    name = Column(String(50), primary_key=True)
+    version = Column(Integer, nullable=False, default=0)
+
+
+class SchedulerLease(Base):
+    """Leader-election lease for background jobs (one row per job name)."""
+    __tablename__ = "scheduler_leases"
+    name = Column(String(50), primary_key=True)
+    holder = Column(String(100), nullable=False)
+    expires_at = Column(Float, nullable=False)  # unix timestamp
+
+
 class IssueType(str, enum.Enum):
     parking = "parking"
     hawker = "hawker"
@@ -58,3 +73,41 @@ class Report(Base):
     approved_at = Column(DateTime(timezone=True), nullable=True)
     closed_at = Column(DateTime(timezone=True), nullable=True)
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+    # SLA: next time the scheduler should escalate this report (NULL once closed).
+    due_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    escalated_at = Column(DateTime(timezone=True), nullable=True, index=True)
+    escalation_level = Column(Integer, nullable=False, default=0, server_default="0")
+
+
+class ReportTransition(Base):
+    """
+    Append-only log of report status and photo-status changes.
+    `id` is the monotonically increasing offset consumers read from.
+    """
+    __tablename__ = "report_transitions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    report_pk = Column(String(36), nullable=False, index=True)
+    report_id = Column(String(20), nullable=False)
+    issue_type = Column(SQLEnum(IssueType), nullable=False)
+    field = Column(String(20), nullable=False)  # "status" or "photo_status"
+    from_value = Column(String(20), nullable=True)  # NULL for the initial RECEIVED entry
+    to_value = Column(String(20), nullable=False)
+    dwell_seconds = Column(Float, nullable=True)  # time in from_value; NULL if unknown
+    created_at = Column(DateTime(timezone=True), nullable=False)
+
+
+class ConsumerCheckpoint(Base):
+    """Last report_transitions.id processed by each named consumer."""
+    __tablename__ = "consumer_checkpoints"
+    name = Column(String(50), primary_key=True)
+    position = Column(Integer, nullable=False, default=0)
+
+
+class StatusDwellStat(Base):
+    """Running totals of time spent per (issue_type, status), fed from report_transitions."""
+    __tablename__ = "status_dwell_stats"
+    issue_type = Column(String(20), primary_key=True)
+    status = Column(String(20), primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
+    total_seconds = Column(Float, nullable=False, default=0)
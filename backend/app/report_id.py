@@ -1,6 +1,7 @@
 """
 Report ID generation: SLP-YYYY-XXXX (e.g. SLP-2026-00421).
-Atomic increment is done in crud.get_next_report_id() using report_id_counter table.
+Atomic increment is done in crud._next_report_id() using report_id_counter table,
+inside the same transaction as the report insert (crud.create_report).
 """
 
 from datetime import datetime
@@ -3,13 +3,13 @@ from sqlalchemy.orm import Session
 from typing import Optional
 
 from ..database import get_db
-from .. import crud, schemas, models
+from .. import analytics, crud, schemas, models
 from ..auth import verify_admin
 
 router = APIRouter(prefix="/api/admin", tags=["admin"])
 
 
-@router.get("/reports", response_model=list[schemas.ReportResponse])
+@router.get("/reports", response_model=list[schemas.AdminReportResponse])
 def list_reports(
     status: Optional[str] = Query(None),
     issue_type: Optional[str] = Query(None),
@@ -33,7 +33,50 @@ def list_reports(
     return crud.list_reports(db, status_filter=status_enum, issue_type=issue_enum, skip=skip, limit=limit)
 
 
-@router.patch("/reports/{report_id}/status", response_model=schemas.ReportResponse)
+@router.get("/overdue", response_model=list[schemas.AdminReportResponse])
+def list_overdue_reports(
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=200),
+    db: Session = Depends(get_db),
+    _: str = Depends(verify_admin),
+):
+    """Reports escalated by the SLA scheduler, most-escalated first."""
+    return crud.list_overdue_reports(db, skip=skip, limit=limit)
+
+
+@router.get("/transitions", response_model=schemas.TransitionPage)
+def list_transitions(
+    after: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=5000),
+    db: Session = Depends(get_db),
+    _: str = Depends(verify_admin),
+):
+    """Read the status-transition log from offset `after` (exclusive)."""
+    items = crud.read_transitions(db, after=after, limit=limit)
+    return schemas.TransitionPage(items=items, next_offset=items[-1].id if items else after)
+
+
+@router.get("/analytics/status-dwell", response_model=list[schemas.StatusDwellItem])
+def status_dwell(
+    db: Session = Depends(get_db),
+    _: str = Depends(verify_admin),
+):
+    """
+    Average time reports spend in each status, per issue type. Updated by the
+    analytics leader loop, so it may lag the transition log by one tick.
+    """
+    return [
+        schemas.StatusDwellItem(
+            issue_type=s.issue_type,
+            status=s.status,
+            count=s.count,
+            avg_seconds=s.total_seconds / s.count if s.count else 0.0,
+        )
+        for s in analytics.status_dwell_summary(db)
+    ]
+
+
+@router.patch("/reports/{report_id}/status", response_model=schemas.AdminReportResponse)
 def update_report_status(
     report_id: str,
     body: schemas.ReportStatusUpdate,
@@ -1,16 +1,28 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
+from fastapi.concurrency import run_in_threadpool
+from pydantic import TypeAdapter
 from sqlalchemy.orm import Session
 from typing import Optional
 from pathlib import Path
 from datetime import datetime, timezone
+import uuid
 
+from ..config import settings
 from ..database import get_db
 from .. import crud, schemas, models
+from ..snapshots import listing_cache, respond
 
 router = APIRouter(prefix="/api/reports", tags=["reports"])
 
 UPLOADS_ROOT = Path("uploads") / "reports"
 
+_REPORT_LIST = TypeAdapter(list[schemas.ReportResponse])
+_PHOTO_LIST = TypeAdapter(list[schemas.PhotoReportItem])
+
+
+def _public_base_url(request: Request) -> str:
+    return (settings.PUBLIC_BASE_URL or str(request.base_url)).rstrip("/")
+
 
 @router.post("", response_model=schemas.ReportCreateResult)
 async def create_report(
@@ -35,34 +47,38 @@ async def create_report(
     except ValueError:
         raise HTTPException(400, "Invalid issue_type")
 
-    photo_path: Optional[str] = None
-    image_url: Optional[str] = None
-    report_id_for_file: Optional[str] = None
+    # The photo is written to a temporary name first and moved to
+    # <report_id><suffix> only after the report (and its ID) is committed.
+    suffix: Optional[str] = None
+    tmp: Optional[Path] = None
 
     if photo is not None:
-        report_id_for_file = crud.get_next_report_id(db)
         UPLOADS_ROOT.mkdir(parents=True, exist_ok=True)
         suffix = (Path(photo.filename).suffix or ".jpg").lower()
         if suffix not in {".jpg", ".jpeg", ".png", ".gif", ".webp", ".avif"}:
             suffix = ".jpg"
-        filename = f"{report_id_for_file}{suffix}"
-        dest = UPLOADS_ROOT / filename
+        tmp = UPLOADS_ROOT / f".{uuid.uuid4().hex}{suffix}.part"
         contents = await photo.read()
-        dest.write_bytes(contents)
-        photo_path = f"uploads/reports/{filename}"
-        image_url = f"/uploads/reports/{filename}"
+        tmp.write_bytes(contents)
 
     data = schemas.ReportCreate(
         issue_type=it,
         description=description,
-        image_url=image_url,
-        photo_path=photo_path,
         latitude=latitude,
         longitude=longitude,
         location_text=location,
         phone_number=phone_number,
     )
-    report = crud.create_report(db, data, report_id=report_id_for_file)
+    try:
+        # Off the event loop: the write may wait on the group-commit writer,
+        # and concurrent submissions must be able to share its batches.
+        report = await run_in_threadpool(crud.create_report, db, data, photo_suffix=suffix)
+    except Exception:
+        if tmp is not None:
+            tmp.unlink(missing_ok=True)
+        raise
+    if tmp is not None:
+        tmp.replace(report.photo_path)
     return schemas.ReportCreateResult(
         success=True,
         report_id=report.report_id,
@@ -78,13 +94,24 @@ def list_all_reports(
     """
     List all citizen reports (for SMC Dashboard). Sorted by latest first.
     Includes photo URL for each report.
+    Served from a precompressed snapshot rebuilt only when reports change.
     """
+    base_url = _public_base_url(request)
+    version = crud.get_data_version(db)
+    snap = listing_cache.get(
+        ("reports", base_url),
+        version,
+        lambda: _REPORT_LIST.dump_json(_build_report_list(db, base_url)),
+    )
+    return respond(request, snap)
+
+
+def _build_report_list(db: Session, base_url: str) -> list[schemas.ReportResponse]:
     reports = (
         db.query(models.Report)
         .order_by(models.Report.created_at.desc())
         .all()
     )
-    base_url = str(request.base_url).rstrip("/")
     out: list[schemas.ReportResponse] = []
     for r in reports:
         # Ensure image_url is absolute when needed for cross-origin frontend
@@ -121,14 +148,25 @@ def list_photo_reports_for_verification(
 ):
     """
     List reports that have an associated photo for SMC verification.
+    Served from a precompressed snapshot rebuilt only when reports change.
     """
+    base_url = _public_base_url(request)
+    version = crud.get_data_version(db)
+    snap = listing_cache.get(
+        ("photos", base_url),
+        version,
+        lambda: _PHOTO_LIST.dump_json(_build_photo_list(db, base_url)),
+    )
+    return respond(request, snap)
+
+
+def _build_photo_list(db: Session, base_url: str) -> list[schemas.PhotoReportItem]:
     reports = (
         db.query(models.Report)
         .filter(models.Report.photo_path.isnot(None))
         .order_by(models.Report.created_at.desc())
         .all()
     )
-    base_url = str(request.base_url).rstrip("/")
     items: list[schemas.PhotoReportItem] = []
     for r in reports:
         # If image_url is already absolute, use it; otherwise build from base URL.
@@ -164,12 +202,9 @@ def update_photo_status(
     """
     Update photo verification status for a report.
     """
-    r = crud.get_report_by_id(db, report_id)
+    r = crud.update_photo_status(db, report_id, body.photo_status)
     if not r:
         raise HTTPException(404, "Report not found")
-    r.photo_verification_status = body.photo_status
-    db.commit()
-    db.refresh(r)
     return r
 
 
@@ -198,7 +233,7 @@ def get_report(
         raise HTTPException(404, "Report not found")
     image_url = r.image_url
     if image_url and not image_url.startswith("http"):
-        base_url = str(request.base_url).rstrip("/")
+        base_url = _public_base_url(request)
         image_url = f"{base_url}{image_url}" if image_url.startswith("/") else f"{base_url}/{image_url}"
     return schemas.ReportResponse(
         id=r.id,
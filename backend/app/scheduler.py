@@ -0,0 +1,119 @@
+"""
+Background jobs that must run on exactly one worker at a time.
+
+Every uvicorn worker runs each loop's thread, but only the holder of that
+loop's lease in scheduler_leases does any work, so running several workers
+(or several instances against one database) performs each job once per tick.
+
+- SlaScheduler ("sla" lease) escalates overdue reports.
+- AnalyticsScheduler ("analytics" lease) advances the transition-log
+  consumers in analytics.py.
+"""
+
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+from datetime import datetime, timezone
+
+from sqlalchemy.orm import Session
+
+from . import analytics, crud
+from .config import settings
+from .write_queue import run_write
+
+logger = logging.getLogger(__name__)
+
+LEASE_NAME = "sla"
+ANALYTICS_LEASE_NAME = "analytics"
+
+
+class LeaderLoop:
+    """Calls tick() every `tick_seconds`; subclasses check the lease themselves."""
+
+    def __init__(self, lease_name: str, tick_seconds: int, lease_seconds: int) -> None:
+        self.lease_name = lease_name
+        self.tick_seconds = tick_seconds
+        self.lease_seconds = lease_seconds
+        self.holder = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name=f"{self.lease_name}-scheduler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        try:
+            run_write(lambda db: crud.release_lease(db, self.lease_name, self.holder))
+        except Exception:
+            logger.exception("Failed to release %s lease", self.lease_name)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            try:
+                self.tick()
+            except Exception:
+                logger.exception("%s scheduler tick failed", self.lease_name)
+            self._stop.wait(self.tick_seconds)
+
+    def renew_lease(self, db: Session) -> bool:
+        """Take or renew this loop's lease in the caller's transaction."""
+        return crud.acquire_lease(db, self.lease_name, self.holder, self.lease_seconds, time.time())
+
+    def tick(self) -> int:
+        raise NotImplementedError
+
+
+class SlaScheduler(LeaderLoop):
+    def __init__(self, tick_seconds: int, lease_seconds: int, batch_size: int) -> None:
+        super().__init__(LEASE_NAME, tick_seconds, lease_seconds)
+        self.batch_size = batch_size
+
+    def tick(self) -> int:
+        """Escalate everything currently due if this worker is leader. Returns count."""
+        now = datetime.now(timezone.utc)
+        total = 0
+        while not self._stop.is_set():
+            n = run_write(lambda db: self._escalate_batch(db, now))
+            if n is None:
+                break
+            total += n
+            if n < self.batch_size:
+                break
+        return total
+
+    def _escalate_batch(self, db: Session, now: datetime) -> int | None:
+        """
+        Renew the lease and escalate one batch in the same transaction, so a
+        worker that lost the lease mid-backlog stops instead of racing the new
+        leader. Returns None when this worker is not the leader.
+        """
+        if not self.renew_lease(db):
+            return None
+        return crud.escalate_due_reports(db, now, self.batch_size)
+
+
+class AnalyticsScheduler(LeaderLoop):
+    def __init__(self, tick_seconds: int, lease_seconds: int) -> None:
+        super().__init__(ANALYTICS_LEASE_NAME, tick_seconds, lease_seconds)
+
+    def tick(self) -> int:
+        """Fold new transitions into the analytics tables if leader. Returns rows read."""
+        if not run_write(self.renew_lease):
+            return 0
+        return analytics.catch_up_status_dwell()
+
+
+scheduler = SlaScheduler(settings.SLA_TICK_SECONDS, settings.SLA_LEASE_SECONDS, settings.SLA_BATCH_SIZE)
+analytics_scheduler = AnalyticsScheduler(settings.ANALYTICS_TICK_SECONDS, settings.ANALYTICS_LEASE_SECONDS)
@@ -39,6 +39,13 @@ class ReportResponse(BaseModel):
         from_attributes = True
 
 
+class AdminReportResponse(ReportResponse):
+    """ReportResponse plus internal SLA fields; admin endpoints only."""
+    due_at: Optional[datetime] = None
+    escalated_at: Optional[datetime] = None
+    escalation_level: int = 0
+
+
 class ReportStatusUpdate(BaseModel):
     status: ReportStatus
 
@@ -65,3 +72,30 @@ class ReportCreateResult(BaseModel):
     success: bool
     report_id: str
     status: ReportStatus
+
+
+class TransitionResponse(BaseModel):
+    id: int
+    report_id: str
+    issue_type: IssueType
+    field: str
+    from_value: Optional[str] = None
+    to_value: str
+    dwell_seconds: Optional[float] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
+
+
+class TransitionPage(BaseModel):
+    items: list[TransitionResponse]
+    # Pass as `after` on the next call; equals `after` when nothing new.
+    next_offset: int
+
+
+class StatusDwellItem(BaseModel):
+    issue_type: str
+    status: str
+    count: int
+    avg_seconds: float
@@ -0,0 +1,43 @@
+"""
+SLA policy: how long a report may stay in a status before it is escalated.
+"""
+
+from datetime import datetime, timedelta
+
+from .models import IssueType, ReportStatus
+
+# Hours allowed per (status, issue_type). Statuses not listed (CLOSED, IGNORED)
+# have no SLA.
+SLA_HOURS: dict[ReportStatus, dict[IssueType, int]] = {
+    ReportStatus.RECEIVED: {
+        IssueType.parking: 4,
+        IssueType.hawker: 12,
+        IssueType.blocked: 2,
+        IssueType.signal: 2,
+    },
+    ReportStatus.UNDER_REVIEW: {
+        IssueType.parking: 24,
+        IssueType.hawker: 72,
+        IssueType.blocked: 12,
+        IssueType.signal: 8,
+    },
+    ReportStatus.ACTION_PLANNED: {
+        IssueType.parking: 72,
+        IssueType.hawker: 168,
+        IssueType.blocked: 48,
+        IssueType.signal: 24,
+    },
+}
+# Legacy status; same window as ACTION_PLANNED.
+SLA_HOURS[ReportStatus.APPROVED] = SLA_HOURS[ReportStatus.ACTION_PLANNED]
+
+
+def sla_window(issue_type: IssueType, status: ReportStatus) -> timedelta | None:
+    hours = SLA_HOURS.get(status, {}).get(issue_type)
+    return timedelta(hours=hours) if hours is not None else None
+
+
+def compute_due_at(issue_type: IssueType, status: ReportStatus, since: datetime) -> datetime | None:
+    """Due time for a report that entered `status` at `since` (None = no SLA)."""
+    window = sla_window(issue_type, status)
+    return since + window if window is not None else None
@@ -0,0 +1,139 @@
+"""
+Versioned, precompressed snapshots of the public report listings.
+
+GET /api/reports and /api/reports/photos are loaded by every dashboard
+browser. Instead of re-querying and re-encoding the full list per request,
+each listing is built once per data version (data_versions.reports, bumped
+by crud on every report write), stored as raw/gzip/brotli bytes with an
+ETag, and served as-is. Concurrent misses for the same listing wait on one
+rebuild.
+"""
+
+import gzip
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Callable
+
+from fastapi import Request, Response
+
+from .config import settings
+
+try:
+    import brotli
+
+    BROTLI_AVAILABLE = True
+except ImportError:
+    BROTLI_AVAILABLE = False
+
+
+@dataclass(frozen=True)
+class Snapshot:
+    version: int
+    etag_base: str
+    bodies: dict[str, bytes]  # encoding ("identity", "gzip", "br") -> bytes
+
+
+def _encode(body: bytes) -> dict[str, bytes]:
+    bodies = {"identity": body, "gzip": gzip.compress(body, compresslevel=9, mtime=0)}
+    if BROTLI_AVAILABLE:
+        bodies["br"] = brotli.compress(body, quality=9)
+    return bodies
+
+
+def _encoding_weights(header: str) -> dict[str, float]:
+    """Parse Accept-Encoding into {coding: q}; q=0 means explicitly refused."""
+    weights: dict[str, float] = {}
+    for part in header.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        param = params.strip()
+        if param.startswith("q="):
+            try:
+                q = float(param[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+    return weights
+
+
+class SnapshotCache:
+    """
+    LRU of at most `max_entries` snapshots. Keys include the base URL, which
+    comes from the Host header unless PUBLIC_BASE_URL is set, so unknown hosts
+    can only push older entries out; they can never lock a real host out.
+    """
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max(1, max_entries)
+        self._snapshots: OrderedDict[tuple[str, ...], Snapshot] = OrderedDict()
+        self._locks: dict[tuple[str, ...], threading.Lock] = {}
+        self._guard = threading.Lock()
+
+    def get(self, key: tuple[str, ...], version: int, build: Callable[[], bytes]) -> Snapshot:
+        """Return the snapshot for `key` at `version`, building it at most once."""
+        with self._guard:
+            snap = self._snapshots.get(key)
+            if snap is not None and snap.version == version:
+                self._snapshots.move_to_end(key)
+                return snap
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            with self._guard:
+                snap = self._snapshots.get(key)
+            if snap is not None and snap.version >= version:
+                return snap
+            try:
+                body = build()
+            except Exception:
+                with self._guard:
+                    if key not in self._snapshots:
+                        self._locks.pop(key, None)
+                raise
+            # The body hash keeps ETags distinct across hosts (different
+            # absolute URLs) while staying identical across workers.
+            digest = hashlib.blake2b(body, digest_size=8).hexdigest()
+            snap = Snapshot(
+                version=version,
+                etag_base=f"{key[0]}-v{version}-{digest}",
+                bodies=_encode(body),
+            )
+            with self._guard:
+                self._snapshots[key] = snap
+                self._snapshots.move_to_end(key)
+                while len(self._snapshots) > self.max_entries:
+                    evicted, _ = self._snapshots.popitem(last=False)
+                    self._locks.pop(evicted, None)
+            return snap
+
+
+def respond(request: Request, snap: Snapshot) -> Response:
+    """Serve a snapshot, negotiating Content-Encoding and honouring If-None-Match."""
+    weights = _encoding_weights(request.headers.get("accept-encoding", ""))
+    encoding = "identity"
+    for candidate in ("br", "gzip"):
+        if candidate in snap.bodies and weights.get(candidate, weights.get("*", 0.0)) > 0:
+            encoding = candidate
+            break
+    etag = f'"{snap.etag_base}"' if encoding == "identity" else f'"{snap.etag_base}-{encoding}"'
+    headers = {
+        "ETag": etag,
+        "Vary": "Accept-Encoding",
+        "Cache-Control": "no-cache",
+    }
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match:
+        tags = {t.strip().removeprefix("W/") for t in if_none_match.split(",")}
+        if etag in tags or "*" in tags:
+            return Response(status_code=304, headers=headers)
+    return Response(content=snap.bodies[encoding], media_type="application/json", headers=headers)
+
+
+listing_cache = SnapshotCache(settings.SNAPSHOT_MAX_ENTRIES)
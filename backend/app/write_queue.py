@@ -0,0 +1,172 @@
+"""
+Single-writer queue for SQLite performance mode.
+
+SQLite allows one writer at a time, so instead of every request committing
+on its own (and racing for the lock), writes are submitted here as small
+jobs. One background thread drains the queue, runs each job inside its own
+savepoint and commits the whole batch once (group commit). Readers keep
+using their own sessions and read concurrently from WAL snapshots.
+"""
+
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable, TypeVar
+
+from sqlalchemy.orm import Session, sessionmaker
+
+from .config import settings
+from .database import engine, SessionLocal
+
+T = TypeVar("T")
+
+# expire_on_commit=False so objects returned by jobs stay readable after the
+# batch commits and the writer session is closed.
+WriterSession = sessionmaker(
+    bind=engine.execution_options(sqlite_begin="IMMEDIATE"),
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+_STOP = object()
+
+
+class WriteQueue:
+    def __init__(self, batch_size: int, batch_wait_ms: int) -> None:
+        self.batch_size = max(1, batch_size)
+        self.batch_wait = max(0, batch_wait_ms) / 1000.0
+        self._queue: queue.Queue = queue.Queue()
+        self._thread: threading.Thread | None = None
+        self._accepting = False
+        self._accepting_lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._accepting = True
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Flush pending jobs and stop the writer thread."""
+        if self._thread is None:
+            return
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+        self._thread = None
+
+    def submit(self, job: Callable[[Session], T]) -> T:
+        """
+        Run job(session) on the writer thread and block until its batch commits.
+        Exceptions raised by the job (or by the commit) are re-raised here.
+        """
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("submit() called from the writer thread")
+        fut: Future = Future()
+        with self._accepting_lock:
+            if not self._accepting:
+                raise RuntimeError("SQLite writer is not running")
+            self._queue.put((job, fut))
+        return fut.result()
+
+    def _run(self) -> None:
+        try:
+            stopping = False
+            while not stopping:
+                item = self._queue.get()
+                if item is _STOP:
+                    break
+                batch = [item]
+                deadline = time.monotonic() + self.batch_wait
+                while len(batch) < self.batch_size:
+                    timeout = deadline - time.monotonic()
+                    try:
+                        item = self._queue.get(timeout=timeout) if timeout > 0 else self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if item is _STOP:
+                        stopping = True
+                        break
+                    batch.append(item)
+                try:
+                    self._commit_batch(batch)
+                except Exception as exc:
+                    _fail_pending(batch, exc)
+                except BaseException as exc:
+                    _fail_pending(batch, exc)
+                    raise
+        finally:
+            # Never leave a submitter waiting on a queue nobody will drain.
+            with self._accepting_lock:
+                self._accepting = False
+            leftover = []
+            while True:
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if item is not _STOP:
+                    leftover.append(item)
+            _fail_pending(leftover, RuntimeError("SQLite writer stopped"))
+
+    def _commit_batch(self, batch: list[tuple[Callable[[Session], object], Future]]) -> None:
+        session = WriterSession()
+        done: list[tuple[Future, object]] = []
+        try:
+            for job, fut in batch:
+                if not fut.set_running_or_notify_cancel():
+                    continue
+                try:
+                    # A failing job only rolls back its own savepoint.
+                    with session.begin_nested():
+                        result = job(session)
+                except Exception as exc:
+                    fut.set_exception(exc)
+                    continue
+                done.append((fut, result))
+            session.commit()
+        except Exception as exc:
+            _fail_pending(batch, exc)
+            try:
+                session.rollback()
+            except Exception:
+                pass
+            return
+        finally:
+            try:
+                session.close()
+            except Exception:
+                pass
+        for fut, result in done:
+            fut.set_result(result)
+
+
+def _fail_pending(batch: list[tuple[Callable[[Session], object], Future]], exc: BaseException) -> None:
+    for _, fut in batch:
+        if not fut.done():
+            fut.set_exception(exc)
+
+
+writer = WriteQueue(settings.SQLITE_WRITE_BATCH_SIZE, settings.SQLITE_WRITE_BATCH_WAIT_MS)
+
+
+def run_write(job: Callable[[Session], T]) -> T:
+    """Run a write job in its own transaction (via the writer thread if active)."""
+    if writer.running:
+        return writer.submit(job)
+    db = SessionLocal()
+    try:
+        result = job(db)
+        db.commit()
+        return result
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -0,0 +1,174 @@
+"""
+Report submission throughput on SQLite, default mode vs performance mode.
+
+    cd backend
+    python -m benchmarks.bench_sqlite_writes --threads 16 --reports 2000
+
+Two paths are measured:
+
+- http:   a real uvicorn server receiving concurrent POST /api/reports
+          (end-to-end submission throughput, the number that matters)
+- direct: crud.create_report called from threads (database layer only)
+
+Each run uses a fresh subprocess and temporary database file, because the
+engine is configured from settings at import time.
+"""
+
+import argparse
+import os
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+import httpx
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+
+def _direct_worker(n: int, errors: list) -> None:
+    from app import crud, models, schemas
+    from app.database import SessionLocal
+
+    for i in range(n):
+        db = SessionLocal()
+        try:
+            crud.create_report(
+                db,
+                schemas.ReportCreate(
+                    issue_type=models.IssueType.parking,
+                    description=f"bench {i}",
+                    location_text="Navi Peth",
+                    phone_number="9000000000",
+                ),
+            )
+        except Exception as exc:  # "database is locked" in default mode
+            db.rollback()
+            errors.append(exc)
+        finally:
+            db.close()
+
+
+def _http_worker(base_url: str, n: int, errors: list) -> None:
+    with httpx.Client(base_url=base_url, timeout=60) as client:
+        for i in range(n):
+            try:
+                r = client.post(
+                    "/api/reports",
+                    data={
+                        "issue_type": "parking",
+                        "description": f"bench {i}",
+                        "location": "Navi Peth",
+                        "phone_number": "9000000000",
+                    },
+                )
+                r.raise_for_status()
+            except Exception as exc:
+                errors.append(exc)
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _run_threads(threads: int, target, args: tuple) -> tuple[float, list]:
+    errors: list = []
+    pool = [threading.Thread(target=target, args=args + (errors,)) for _ in range(threads)]
+    start = time.perf_counter()
+    for t in pool:
+        t.start()
+    for t in pool:
+        t.join()
+    return time.perf_counter() - start, errors
+
+
+def run_direct(threads: int, per_thread: int) -> tuple[float, list]:
+    from app.database import Base, engine, SQLITE_PERFORMANCE_MODE
+    from app.main import _run_simple_migrations
+    from app.write_queue import writer
+
+    Base.metadata.create_all(bind=engine)
+    _run_simple_migrations()
+    if SQLITE_PERFORMANCE_MODE:
+        writer.start()
+    try:
+        return _run_threads(threads, _direct_worker, (per_thread,))
+    finally:
+        writer.stop()
+
+
+def run_http(threads: int, per_thread: int) -> tuple[float, list]:
+    port = _free_port()
+    base_url = f"http://127.0.0.1:{port}"
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+    )
+    try:
+        deadline = time.monotonic() + 30
+        while True:
+            try:
+                if httpx.get(f"{base_url}/health").status_code == 200:
+                    break
+            except httpx.HTTPError:
+                pass
+            if time.monotonic() > deadline:
+                raise RuntimeError("uvicorn did not start")
+            time.sleep(0.1)
+        return _run_threads(threads, _http_worker, (base_url, per_thread))
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def run_once(path: str, threads: int, reports: int) -> None:
+    per_thread = reports // threads
+    if path == "http":
+        elapsed, errors = run_http(threads, per_thread)
+    else:
+        elapsed, errors = run_direct(threads, per_thread)
+    ok = per_thread * threads - len(errors)
+    mode = "performance" if os.environ.get("SQLITE_PERFORMANCE_MODE") == "true" else "default"
+    print(f"{path:<7} {mode:<12} {ok:>6} ok {len(errors):>5} failed {elapsed:8.2f}s {ok / elapsed:9.1f} reports/s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--reports", type=int, default=2000)
+    parser.add_argument("--path", choices=["http", "direct", "both"], default="both")
+    parser.add_argument("--child", choices=["http", "direct"], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_once(args.child, args.threads, args.reports)
+        return
+
+    paths = ["http", "direct"] if args.path == "both" else [args.path]
+    for path in paths:
+        for perf in ("false", "true"):
+            with tempfile.TemporaryDirectory() as tmp:
+                env = dict(
+                    os.environ,
+                    DATABASE_URL=f"sqlite:///{tmp}/bench.db",
+                    SQLITE_PERFORMANCE_MODE=perf,
+                    SLA_SCHEDULER_ENABLED="false",
+                )
+                subprocess.run(
+                    [
+                        sys.executable, "-m", "benchmarks.bench_sqlite_writes", "--child", path,
+                        "--threads", str(args.threads), "--reports", str(args.reports),
+                    ],
+                    cwd=BACKEND_DIR,
+                    env=env,
+                    check=True,
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+import os
+import tempfile
+
+# Settings are read at import time, so point the app at a throwaway SQLite
+# database (in performance mode) before anything from app/ is imported.
+_tmp = tempfile.mkdtemp()
+os.environ["DATABASE_URL"] = f"sqlite:///{_tmp}/test.db"
+os.environ["SQLITE_PERFORMANCE_MODE"] = "true"
+os.environ["SLA_SCHEDULER_ENABLED"] = "false"
+os.environ["ANALYTICS_CONSUMERS_ENABLED"] = "false"
+
+import pytest  # noqa: E402
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def fresh_db():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    yield
+
+
+@pytest.fixture
+def db():
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
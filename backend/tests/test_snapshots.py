@@ -0,0 +1,127 @@
+import threading
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import snapshots
+from app.main import app
+from app.snapshots import SnapshotCache
+
+
+@pytest.fixture
+def client(monkeypatch):
+    # Each test starts from an empty database, so versions restart at 0.
+    monkeypatch.setattr(snapshots.listing_cache, "_snapshots", type(snapshots.listing_cache._snapshots)())
+    with TestClient(app) as c:
+        yield c
+
+
+def _submit(client) -> str:
+    r = client.post("/api/reports", data={"issue_type": "parking", "phone_number": "9000000000"})
+    return r.json()["report_id"]
+
+
+@pytest.mark.parametrize(
+    "accept, expected",
+    [
+        ("gzip", "gzip"),
+        ("gzip;q=0", None),
+        ("identity", None),
+        ("*", "br" if snapshots.BROTLI_AVAILABLE else "gzip"),
+        ("br;q=0, *", "gzip"),
+        ("*;q=0, gzip", "gzip"),
+    ],
+)
+def test_accept_encoding_negotiation(client, accept, expected):
+    _submit(client)
+    r = client.get("/api/reports", headers={"Accept-Encoding": accept})
+    assert r.status_code == 200
+    assert r.headers.get("content-encoding") == expected
+    assert r.headers["vary"] == "Accept-Encoding"
+    assert len(r.json()) == 1
+
+
+def test_if_none_match_returns_304(client):
+    _submit(client)
+    first = client.get("/api/reports", headers={"Accept-Encoding": "gzip"})
+    again = client.get(
+        "/api/reports", headers={"Accept-Encoding": "gzip", "If-None-Match": first.headers["etag"]}
+    )
+    assert again.status_code == 304
+    assert again.headers["etag"] == first.headers["etag"]
+    assert again.content == b""
+
+
+@pytest.mark.parametrize("path", ["/api/reports", "/api/reports/photos"])
+def test_writes_change_etag(client, path):
+    def etag():
+        return client.get(path, headers={"Accept-Encoding": "gzip"}).headers["etag"]
+
+    before = etag()
+    report_id = _submit(client)
+    after_create = etag()
+    client.patch(f"/api/reports/{report_id}", json={"status": "UNDER_REVIEW"})
+    after_status = etag()
+    client.put(f"/api/reports/{report_id}/photo-status", json={"photo_status": "Valid"})
+    after_photo = etag()
+    assert len({before, after_create, after_status, after_photo}) == 4
+
+
+def test_etag_differs_per_host(client, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)  # the photo is saved under ./uploads/reports
+    client.post(
+        "/api/reports",
+        data={"issue_type": "parking", "phone_number": "9000000000"},
+        files={"photo": ("p.jpg", b"jpeg", "image/jpeg")},
+    )
+    a = client.get("/api/reports/photos", headers={"Host": "a.example"})
+    b = client.get("/api/reports/photos", headers={"Host": "b.example"})
+    assert a.json()[0]["photo_url"].startswith("http://a.example/")
+    assert a.headers["etag"] != b.headers["etag"]
+
+
+def test_unknown_hosts_cannot_evict_caching_for_good():
+    cache = SnapshotCache(max_entries=2)
+    calls = []
+
+    def build(host):
+        def _build():
+            calls.append(host)
+            return host.encode()
+
+        return _build
+
+    cache.get(("reports", "real"), 1, build("real"))
+    for i in range(5):
+        cache.get(("reports", f"bogus{i}"), 1, build(f"bogus{i}"))
+    snap = cache.get(("reports", "real"), 1, build("real"))
+    assert "gzip" in snap.bodies
+    assert cache.get(("reports", "real"), 1, build("real")) is snap
+    assert calls.count("real") == 2
+    assert len(cache._snapshots) <= 2 and len(cache._locks) <= 2
+
+
+def test_concurrent_misses_share_one_build():
+    cache = SnapshotCache(max_entries=4)
+    calls = []
+    started = threading.Barrier(8)
+
+    def build():
+        calls.append(1)
+        time.sleep(0.2)
+        return b"[]"
+
+    results = []
+
+    def fetch():
+        started.wait()
+        results.append(cache.get(("reports", "h"), 3, build))
+
+    threads = [threading.Thread(target=fetch) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert len({id(s) for s in results}) == 1
@@ -0,0 +1,97 @@
+import pytest
+
+from app import analytics, crud, models, schemas
+from app.database import SessionLocal
+from app.scheduler import AnalyticsScheduler
+
+
+def _new_report(db, issue_type=models.IssueType.hawker) -> models.Report:
+    return crud.create_report(
+        db, schemas.ReportCreate(issue_type=issue_type, phone_number="9000000000")
+    )
+
+
+def test_transitions_are_logged_in_id_order(db):
+    r = _new_report(db)
+    for status in (
+        models.ReportStatus.UNDER_REVIEW,
+        models.ReportStatus.UNDER_REVIEW,  # no change, not logged
+        models.ReportStatus.ACTION_PLANNED,
+        models.ReportStatus.CLOSED,
+    ):
+        crud.update_report_status(db, r.report_id, status)
+    crud.update_photo_status(db, r.report_id, models.PhotoVerificationStatus.VALID)
+
+    rows = crud.read_transitions(db)
+    ids = [t.id for t in rows]
+    assert ids == sorted(ids) and len(set(ids)) == len(ids)
+    assert [(t.field, t.from_value, t.to_value) for t in rows] == [
+        ("status", None, "RECEIVED"),
+        ("status", "RECEIVED", "UNDER_REVIEW"),
+        ("status", "UNDER_REVIEW", "ACTION_PLANNED"),
+        ("status", "ACTION_PLANNED", "CLOSED"),
+        ("photo_status", None, "Valid"),
+    ]
+    assert all(t.dwell_seconds is not None for t in rows[1:4])
+
+    newer = crud.read_transitions(db, after=ids[2])
+    assert [t.id for t in newer] == ids[3:]
+
+
+def test_dwell_unknown_for_status_entered_before_the_log(db):
+    r = _new_report(db)
+    # Simulate a report whose history predates the transition log.
+    db.query(models.ReportTransition).delete()
+    db.commit()
+
+    crud.update_report_status(db, r.report_id, models.ReportStatus.UNDER_REVIEW)
+    (t,) = crud.read_transitions(db)
+    assert t.dwell_seconds is None
+
+
+def test_concurrent_checkpoint_advance_conflicts():
+    first, second = SessionLocal(), SessionLocal()
+    try:
+        # Both runs read the same position before either advances it.
+        seen_first = crud.get_checkpoint(first, "c")
+        first.commit()
+        seen_second = crud.get_checkpoint(second, "c")
+        second.commit()
+        assert seen_first == seen_second == 0
+
+        crud.advance_checkpoint(first, "c", seen_first, 5)
+        first.commit()
+        with pytest.raises(crud.CheckpointConflict):
+            crud.advance_checkpoint(second, "c", seen_second, 7)
+        second.rollback()
+        assert crud.get_checkpoint(second, "c") == 5
+    finally:
+        first.close()
+        second.close()
+
+
+def test_status_dwell_consumer_counts_each_transition_once(db):
+    r = _new_report(db)
+    crud.update_report_status(db, r.report_id, models.ReportStatus.UNDER_REVIEW)
+
+    analytics.catch_up_status_dwell()
+    analytics.catch_up_status_dwell()
+    db.rollback()  # end this session's read snapshot to see the consumer's commits
+
+    stats = {(s.issue_type, s.status): s.count for s in analytics.status_dwell_summary(db)}
+    assert stats == {("hawker", "RECEIVED"): 1}
+    assert crud.get_checkpoint(db, analytics.STATUS_DWELL) == crud.read_transitions(db)[-1].id
+
+
+def test_analytics_loop_runs_consumers_only_as_leader(db):
+    r = _new_report(db)
+    crud.update_report_status(db, r.report_id, models.ReportStatus.UNDER_REVIEW)
+
+    leader = AnalyticsScheduler(tick_seconds=30, lease_seconds=90)
+    follower = AnalyticsScheduler(tick_seconds=30, lease_seconds=90)
+    assert leader.tick() == 2
+    assert follower.tick() == 0
+
+    db.rollback()
+    stats = {(s.issue_type, s.status): s.count for s in analytics.status_dwell_summary(db)}
+    assert stats == {("hawker", "RECEIVED"): 1}
@@ -0,0 +1,96 @@
+import threading
+
+import pytest
+
+from app import models
+from app.database import SessionLocal
+from app.write_queue import WriteQueue
+
+
+def _insert_version(name: str, fail: bool = False):
+    def job(db):
+        db.add(models.DataVersion(name=name, version=1))
+        db.flush()
+        if fail:
+            raise ValueError(name)
+        return name
+
+    return job
+
+
+def _submit_all(q: WriteQueue, jobs) -> list:
+    """Submit jobs from separate threads so they land in one batch."""
+    results: list = [None] * len(jobs)
+
+    def run(i, job):
+        try:
+            results[i] = q.submit(job)
+        except Exception as exc:
+            results[i] = exc
+
+    threads = [threading.Thread(target=run, args=(i, job)) for i, job in enumerate(jobs)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join(timeout=10)
+        assert not t.is_alive(), "submit() never returned"
+    return results
+
+
+def _committed_names() -> set[str]:
+    db = SessionLocal()
+    try:
+        return {v.name for v in db.query(models.DataVersion).all()}
+    finally:
+        db.close()
+
+
+def test_failing_job_only_rolls_back_itself():
+    q = WriteQueue(batch_size=10, batch_wait_ms=200)
+    q.start()
+    try:
+        results = _submit_all(q, [_insert_version("a"), _insert_version("b", fail=True), _insert_version("c")])
+    finally:
+        q.stop()
+
+    assert results[0] == "a"
+    assert isinstance(results[1], ValueError)
+    assert results[2] == "c"
+    assert _committed_names() == {"a", "c"}
+
+
+def test_batch_failure_fails_every_job_and_writer_keeps_running():
+    q = WriteQueue(batch_size=10, batch_wait_ms=200)
+    q.start()
+    try:
+        original = q._commit_batch
+
+        def broken_commit(batch):
+            raise OSError("disk full")
+
+        q._commit_batch = broken_commit
+        results = _submit_all(q, [_insert_version("a"), _insert_version("b")])
+        q._commit_batch = original
+        assert all(isinstance(r, OSError) for r in results)
+        assert q.submit(_insert_version("c")) == "c"
+    finally:
+        q.stop()
+
+    assert _committed_names() == {"c"}
+
+
+@pytest.mark.filterwarnings("ignore::pytest.PytestUnhandledThreadExceptionWarning")
+def test_submit_after_writer_died_raises_instead_of_hanging():
+    q = WriteQueue(batch_size=1, batch_wait_ms=0)
+    q.start()
+
+    def explode(batch):
+        raise SystemExit
+
+    q._commit_batch = explode
+    with pytest.raises(SystemExit):
+        q.submit(_insert_version("a"))
+    q._thread.join(timeout=10)
+    with pytest.raises(RuntimeError):
+        q.submit(_insert_version("b"))
+    q.stop()